@@ -1,16 +1,16 @@
 # backend/add_synonyms.py
 import sys
 import os
-import mysql.connector
 
-# Connect to your database
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'database')))
-from database.db_config import get_db_connection
+# Connect to your database (through the shared, pooled data-access layer)
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from database.db_config import DB_ERRORS
+from database.import_data import clean_text, stem_entry
+from database.synonym_store import ensure_indexes, ensure_schema, upsert_synonym_rows
+from modules.ParaphraseDetection.synonym_graph import reload_synonym_classes
 
 def add_new_words():
     print("--- 🎓 Teaching New Synonyms to Database ---")
-    conn = get_db_connection()
-    cursor = conn.cursor()
 
     # The new words we want to teach
     # Format: (Word, Synonym)
@@ -20,16 +20,23 @@ def add_new_words():
         ("පාඩම", "පාඩම")            # (Optional: reinforcing exact matches)
     ]
 
+    # Same cleaning + stemming as the bulk importer, so lookups by stem work
+    rows = []
+    for word, synonym in new_data:
+        word, synonym = clean_text(word), clean_text(synonym)
+        if word and synonym and word != synonym:
+            rows.append((None, word, synonym, stem_entry(word), stem_entry(synonym)))
+
     try:
-        query = "INSERT INTO synonyms (word, synonym_word) VALUES (%s, %s)"
-        cursor.executemany(query, new_data)
-        conn.commit()
-        print(f"✅ Success! Added {cursor.rowcount} new pairs to the database.")
+        ensure_schema()
+        ensure_indexes()
+        added = upsert_synonym_rows(rows)
+        print(f"✅ Success! Added {added} new pairs to the database.")
+        # The running server picks the new pairs up within SYNONYM_REFRESH_SECONDS
+        reload_synonym_classes()
         
-    except mysql.connector.Error as err:
+    except DB_ERRORS as err:
         print(f"⚠️ Error: {err}")
-    finally:
-        conn.close()
 
 if __name__ == "__main__":
     add_new_words() 
\ No newline at end of file
@@ -1,11 +1,195 @@
 # database/db_config.py
-import mysql.connector
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+# --- CONFIGURATION (taken from the environment) ---
+# DB_BACKEND=sqlite lets the whole project run (and be tested) without a MySQL server.
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql").strip().lower()
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = int(os.getenv("DB_PORT", "3306"))
+DB_USER = os.getenv("DB_USER", "root")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "root")
+DB_NAME = os.getenv("DB_NAME", "sinhala_plagiarism_db")
+SQLITE_PATH = os.getenv(
+    "SQLITE_PATH",
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'sinhala_plagiarism.db'))
+)
+
+# The engine scans URLs with PLAGIARISM_WORKERS threads; give each one a connection
+# plus one spare for the request thread itself.
+PLAGIARISM_WORKERS = int(os.getenv("PLAGIARISM_WORKERS", "7"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", str(PLAGIARISM_WORKERS + 1)))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+# Idle connections are only pinged on checkout after this many seconds unused
+DB_POOL_PING_AFTER = float(os.getenv("DB_POOL_PING_AFTER", "30"))
+
+if DB_BACKEND not in ("mysql", "sqlite"):
+    raise ValueError(f"Unsupported DB_BACKEND '{DB_BACKEND}' (expected 'mysql' or 'sqlite')")
+
+# Paramstyle differs per driver: MySQL uses %s, sqlite3 uses ?
+PLACEHOLDER = "%s" if DB_BACKEND == "mysql" else "?"
+
+if DB_BACKEND == "mysql":
+    import mysql.connector
+    DB_ERRORS = (mysql.connector.Error, sqlite3.Error)
+else:
+    DB_ERRORS = (sqlite3.Error,)
+
+
+def _open_raw_connection():
+    """
+    Opens a brand-new driver connection for the configured backend.
+    """
+    if DB_BACKEND == "mysql":
+        return mysql.connector.connect(
+            host=DB_HOST,
+            port=DB_PORT,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            database=DB_NAME,
+            charset='utf8mb4',  # Critical for Sinhala font support
+            # Reads must not open a transaction: an idle pooled connection would keep a
+            # stale snapshot and a metadata lock. Writes call begin() explicitly.
+            autocommit=True
+        )
+
+    # check_same_thread=False: connections are handed between worker threads by the pool,
+    # but only ever used by one thread at a time.
+    conn = sqlite3.connect(SQLITE_PATH, check_same_thread=False, cached_statements=256)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+class PooledConnection:
+    """
+    Thin wrapper around a driver connection.
+    close() hands the connection back to the pool instead of disconnecting.
+    """
+
+    def __init__(self, pool, raw_conn):
+        self._pool = pool
+        self._raw = raw_conn
+
+    def cursor(self):
+        if self._raw is None:
+            raise sqlite3.ProgrammingError("Connection already returned to the pool")
+        return self._raw.cursor()
+
+    def begin(self):
+        """
+        Starts an explicit transaction for a group of writes.
+        sqlite3 opens one implicitly before the first write.
+        """
+        if DB_BACKEND == "mysql":
+            self._raw.start_transaction()
+
+    def is_connected(self):
+        if self._raw is None:
+            return False
+        if DB_BACKEND == "mysql":
+            return self._raw.is_connected()
+        return True
+
+    def close(self):
+        if self._raw is not None:
+            self._pool._release(self._raw)
+            self._raw = None
+
+    def __getattr__(self, name):
+        # commit(), rollback(), get_server_info(), database ... go straight to the driver
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._raw is not None:
+            if exc_type is None:
+                self._raw.commit()
+            else:
+                self._raw.rollback()
+        self.close()
+        return False
+
+
+class ConnectionPool:
+    """
+    Thread-safe, lazily filled connection pool.
+    Blocks (up to DB_POOL_TIMEOUT seconds) when every connection is checked out,
+    instead of failing like mysql.connector's built-in pool does.
+    """
+
+    def __init__(self, size):
+        self.size = max(1, size)
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def acquire(self, timeout=DB_POOL_TIMEOUT):
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No free database connection after {timeout}s (pool size {self.size})")
+        try:
+            try:
+                raw, idle_since = self._idle.get_nowait()
+                # MySQL drops idle connections after wait_timeout; revive them transparently.
+                # The ping is a round-trip, so recently used connections skip it.
+                if (DB_BACKEND == "mysql" and time.monotonic() - idle_since > DB_POOL_PING_AFTER
+                        and not raw.is_connected()):
+                    raw.reconnect(attempts=2, delay=0)
+            except queue.Empty:
+                raw = _open_raw_connection()
+        except Exception:
+            self._slots.release()
+            raise
+        return PooledConnection(self, raw)
+
+    def _release(self, raw):
+        # Roll back a transaction the borrower left open (an error between begin()
+        # and commit()); otherwise an idle connection keeps its locks. Both drivers
+        # track in_transaction client-side, so the common case costs no round-trip.
+        try:
+            if raw.in_transaction:
+                raw.rollback()
+        except Exception:
+            # Broken connection: drop it, the slot opens a fresh one next time
+            try:
+                raw.close()
+            except Exception:
+                pass
+            self._slots.release()
+            return
+        self._idle.put((raw, time.monotonic()))
+        self._slots.release()
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait()[0].close()
+            except queue.Empty:
+                break
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    Returns the process-wide connection pool, creating it on first use.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_POOL_SIZE)
+    return _pool
+
 
 def get_db_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",        # Change to your MySQL username
-        password="root",# Change to your MySQL password
-        database="sinhala_plagiarism_db",
-        charset='utf8mb4'   # Critical for Sinhala font support
-    )
\ No newline at end of file
+    """
+    Checks a connection out of the shared pool.
+    Calling .close() on it returns it to the pool; it can also be used as a context manager.
+    """
+    return get_pool().acquire()
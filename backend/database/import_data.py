@@ -1,80 +1,169 @@
 # database/import_data.py
-import mysql.connector
-import pandas as pd
+# Usage (from the backend folder):
+#   python database/import_data.py [--csv "data/Dataset(synonyms ).csv"] [--batch-size 5000]
+import argparse
+import csv
 import os
 import sys
+import time
 
-# Add the parent folder to the path so we can import db_config
+# Add the parent folder to the path so we can import the database layer and preprocessor
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from database.db_config import get_db_connection
+from database.db_config import DB_BACKEND, DB_ERRORS
+from database.synonym_store import (
+    IMPORT_BATCH_SIZE,
+    ensure_indexes,
+    ensure_schema,
+    fetch_all_rows,
+    fetch_pair_keys,
+    rewrite_synonym_rows,
+    upsert_synonym_rows,
+)
+from modules.ParaphraseDetection.preprocessor import normalize_sinhala, stem_word
+from modules.ParaphraseDetection.synonym_graph import reload_synonym_classes
+
+DEFAULT_CSV = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'Dataset(synonyms ).csv'))
+
+
+def clean_text(text):
+    """
+    NFC-normalizes Sinhala text and removes stray / repeated whitespace
+    (the CSV has entries like 'අම්මා  ' and zero-width spaces).
+    """
+    return " ".join(normalize_sinhala(text or "").replace('\u200b', ' ').split())
+
+
+def stem_entry(text):
+    """
+    Precomputes the stem for single-word entries; multi-word phrases are kept as-is.
+    """
+    return stem_word(text) if " " not in text else text
 
-def import_csv_to_db():
-    print("🚀 Starting Data Import...")
-    
-    # 1. Connect to Database
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        print("✅ Connected to database.")
-    except Exception as e:
-        print(f"❌ Error connecting to database: {e}")
-        return
 
-    # 2. Load the CSV File
+def normalize_existing_rows():
+    """
+    Brings rows written by older importers in line with a fresh import:
+    both words go through clean_text() (zero-width characters, NFC), missing or
+    outdated stems are filled in, and rows that become empty, self pairs or
+    duplicates (in either order) of an older row are removed.
+    Returns (rows_rewritten, rows_removed).
+    """
+    seen_pairs = set()
+    updates = []
+    delete_ids = []
+    for row_id, word, synonym, word_stem, synonym_stem in fetch_all_rows():
+        clean_word, clean_synonym = clean_text(word), clean_text(synonym)
+        pair_key = tuple(sorted((clean_word, clean_synonym)))
+        if not clean_word or not clean_synonym or clean_word == clean_synonym or pair_key in seen_pairs:
+            delete_ids.append(row_id)
+            continue
+        seen_pairs.add(pair_key)
+
+        cleaned = (
+            clean_word,
+            clean_synonym,
+            stem_entry(clean_word) if clean_word != word or not word_stem else word_stem,
+            stem_entry(clean_synonym) if clean_synonym != synonym or not synonym_stem else synonym_stem,
+        )
+        if cleaned != (word, synonym, word_stem, synonym_stem):
+            updates.append(cleaned + (row_id,))
+
+    rewrite_synonym_rows(updates, delete_ids)
+    return len(updates), len(delete_ids)
+
+
+def stream_synonym_rows(file_path, stats, seen_pairs):
+    """
+    Streams the CSV one row at a time and yields clean
+    (csv_id, word, synonym_word, word_stem, synonym_stem) rows.
+    Symmetric pairs (A,B) / (B,A) and pairs in seen_pairs (already in the
+    database) are skipped; seen_pairs is updated in place.
+    """
     # We use 'utf-8-sig' to handle potential BOM characters from Excel/Notepad
-    file_path = 'data/Dataset(synonyms ).csv'
-    
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = [c.strip() for c in next(reader, [])]
+        try:
+            id_col = header.index('ID')
+            word_col = header.index('word')
+            syn_col = header.index('synonym word')
+        except ValueError:
+            raise ValueError(f"Unexpected CSV header {header}; expected 'ID', 'word', 'synonym word'")
+
+        for row in reader:
+            stats["rows"] += 1
+            if len(row) <= max(id_col, word_col, syn_col):
+                stats["skipped"] += 1
+                continue
+
+            word = clean_text(row[word_col])
+            synonym = clean_text(row[syn_col])
+            if not word or not synonym or word == synonym:
+                stats["skipped"] += 1
+                continue
+
+            pair_key = tuple(sorted((word, synonym)))
+            if pair_key in seen_pairs:
+                stats["duplicates"] += 1
+                continue
+            seen_pairs.add(pair_key)
+
+            yield (row[id_col].strip() or None, word, synonym, stem_entry(word), stem_entry(synonym))
+
+
+def import_csv_to_db(file_path=DEFAULT_CSV, batch_size=IMPORT_BATCH_SIZE):
+    print(f"🚀 Starting Data Import ({DB_BACKEND})...")
+
     if not os.path.exists(file_path):
         print(f"❌ File not found: {file_path}")
         print("Make sure your CSV is in the 'data' folder.")
         return
 
+    start = time.perf_counter()
+    stats = {"rows": 0, "skipped": 0, "duplicates": 0}
+
     try:
-        # Load data using pandas
-        df = pd.read_csv(file_path, encoding='utf-8-sig')
-        
-        # Clean column names (remove extra spaces)
-        df.columns = [c.strip() for c in df.columns]
-        
-        print(f"📄 Found {len(df)} rows in CSV.")
-        print(f"   Columns: {list(df.columns)}")
-
-    except Exception as e:
+        # 1. Schema, then legacy rows re-cleaned like fresh ones (before dedupe + the
+        #    unique index), then indexes, so the unique index guards every insert
+        ensure_schema()
+        rewritten, removed = normalize_existing_rows()
+        if rewritten or removed:
+            print(f"🧹 Normalized {rewritten} existing rows, removed {removed} duplicates / self pairs.")
+        ensure_indexes()
+        print("✅ Schema and indexes ready.")
+
+        # 2. Load the existing pairs up front: the generator below runs while
+        #    upsert_synonym_rows() holds a pooled connection, so it must not borrow another
+        seen_pairs = fetch_pair_keys()
+
+        # 3. Stream, clean and batch-insert
+        rows = stream_synonym_rows(file_path, stats, seen_pairs)
+        inserted_count = upsert_synonym_rows(rows, batch_size=batch_size)
+
+        # 4. Rebuild the synonym classes for callers in this process; a running
+        #    server notices the changed table within SYNONYM_REFRESH_SECONDS
+        reload_synonym_classes()
+
+    except DB_ERRORS + (TimeoutError,) as e:
+        print(f"❌ Database error during import: {e}")
+        return
+    except ValueError as e:
         print(f"❌ Error reading CSV: {e}")
         return
 
-    # 3. Insert Data into MySQL
-    inserted_count = 0
-    errors = 0
-    
-    # SQL Query
-    sql = "INSERT INTO synonyms (csv_id, word, synonym_word) VALUES (%s, %s, %s)"
-
-    for index, row in df.iterrows():
-        try:
-            # Get values from CSV columns (Make sure these match your CSV headers exactly!)
-            csv_id = row['ID']
-            word = row['word']
-            synonym = row['synonym word'] # Adjust if your header is different
-
-            # Execute
-            val = (csv_id, word, synonym)
-            cursor.execute(sql, val)
-            inserted_count += 1
-
-        except Exception as e:
-            print(f"⚠️ Error inserting row {index}: {e}")
-            errors += 1
-
-    # 4. Commit and Close
-    conn.commit()
-    cursor.close()
-    conn.close()
-    
+    elapsed = time.perf_counter() - start
     print("-" * 30)
-    print(f"🎉 Import Finished!")
-    print(f"✅ Successfully inserted: {inserted_count}")
-    print(f"❌ Failed rows: {errors}")
+    print(f"🎉 Import Finished in {elapsed:.2f}s!")
+    print(f"📄 Rows read:                 {stats['rows']}")
+    print(f"✅ Successfully inserted:     {inserted_count}")
+    print(f"♻️ Duplicates / already there: {stats['duplicates']}")
+    print(f"❌ Skipped (empty/self) rows:  {stats['skipped']}")
+    return inserted_count
+
 
 if __name__ == "__main__":
-    import_csv_to_db()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Bulk, idempotent import of the Sinhala synonym CSV.")
+    parser.add_argument("--csv", default=DEFAULT_CSV, help="Path to the synonym CSV file")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="Rows per batched insert")
+    args = parser.parse_args()
+    import_csv_to_db(args.csv, args.batch_size)
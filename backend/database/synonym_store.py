@@ -0,0 +1,393 @@
+# database/synonym_store.py
+# Shared data-access layer for the 'synonyms' table.
+# Every caller (lexical analyzer, import/maintenance scripts) goes through here so that
+# connections come from the pool. Statements are plain parameterized queries: sqlite3
+# caches them per connection, and mysql.connector sends each in a single round-trip.
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from database.db_config import DB_BACKEND, PLACEHOLDER, get_db_connection
+
+# Keep IN (...) lists well below SQLite's host-parameter limit (999 on older builds).
+IN_CLAUSE_CHUNK = 400
+
+# Rows written per executemany() call during bulk imports.
+IMPORT_BATCH_SIZE = 5000
+
+# Stems shorter than this (in code points) are never used for matching: sinling cuts
+# short words down to one letter (මව -> ම, ඔය -> ඔ), and such a stem would pull
+# unrelated words like මගේ (my) or ඔයා (you) into the synonym class.
+MIN_STEM_LENGTH = 3
+
+_SQLITE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS synonyms (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        csv_id TEXT,
+        word TEXT NOT NULL,
+        synonym_word TEXT NOT NULL,
+        word_stem TEXT,
+        synonym_stem TEXT
+    )
+"""
+
+_MYSQL_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS synonyms (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        csv_id VARCHAR(32),
+        word VARCHAR(255) NOT NULL,
+        synonym_word VARCHAR(255) NOT NULL,
+        word_stem VARCHAR(255),
+        synonym_stem VARCHAR(255)
+    ) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin
+"""
+
+# Columns added after the original table layout (csv_id, word, synonym_word).
+_STEM_COLUMNS = {
+    "word_stem": "VARCHAR(255)" if DB_BACKEND == "mysql" else "TEXT",
+    "synonym_stem": "VARCHAR(255)" if DB_BACKEND == "mysql" else "TEXT",
+}
+
+# name -> (columns, unique)
+_INDEXES = {
+    "idx_synonyms_word": ("word", False),
+    "idx_synonyms_synonym_word": ("synonym_word", False),
+    "idx_synonyms_word_stem": ("word_stem", False),
+    "idx_synonyms_synonym_stem": ("synonym_stem", False),
+    "uq_synonyms_pair": ("word, synonym_word", True),
+}
+
+# Portable (MySQL + SQLite) cleanup of rows written by the old per-row importer.
+# The derived table works around MySQL's "can't select from the table you delete from".
+_CLEANUP_QUERIES = (
+    "UPDATE synonyms SET word = TRIM(word), synonym_word = TRIM(synonym_word)",
+    "DELETE FROM synonyms WHERE word = synonym_word",
+    """
+    DELETE FROM synonyms WHERE id NOT IN (
+        SELECT keep_id FROM (
+            SELECT MIN(id) AS keep_id FROM synonyms GROUP BY word, synonym_word
+        ) AS keep_rows
+    )
+    """,
+)
+
+
+def _sql(query):
+    """
+    Queries are written with %s; rewrite them for sqlite3's ? paramstyle.
+    """
+    return query if PLACEHOLDER == "%s" else query.replace("%s", PLACEHOLDER)
+
+
+def _chunks(items, size=IN_CLAUSE_CHUNK):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def is_linkable_stem(stem):
+    return bool(stem) and len(stem) >= MIN_STEM_LENGTH
+
+
+def resolve_stems(rows):
+    """
+    Decides which precomputed stems may stand in for their words.
+    A stem is kept only if it is at least MIN_STEM_LENGTH long and every word
+    carrying it (including the stem itself, if it is a stored word) is connected
+    to the others through the given (word, synonym_word, word_stem, synonym_stem)
+    rows. Stems shared by unrelated words are dropped.
+    Returns {stem: a word carrying it}.
+    """
+    parent = {}
+
+    def find(term):
+        parent.setdefault(term, term)
+        while parent[term] != term:
+            parent[term] = parent[parent[term]]
+            term = parent[term]
+        return term
+
+    carriers = {}
+    for word, synonym, word_stem, synonym_stem in rows:
+        parent[find(synonym)] = find(word)
+        for surface, stem in ((word, word_stem), (synonym, synonym_stem)):
+            if stem != surface and is_linkable_stem(stem):
+                carriers.setdefault(stem, set()).add(surface)
+
+    resolved = {}
+    for stem, surfaces in carriers.items():
+        if stem in parent:
+            surfaces.add(stem)
+        if len({find(surface) for surface in surfaces}) == 1:
+            resolved[stem] = next(iter(surfaces))
+    return resolved
+
+
+def _existing_columns(cursor):
+    if DB_BACKEND == "mysql":
+        cursor.execute(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = DATABASE() AND table_name = 'synonyms'"
+        )
+        return {row[0] for row in cursor.fetchall()}
+    cursor.execute("PRAGMA table_info(synonyms)")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _existing_indexes(cursor):
+    if DB_BACKEND == "mysql":
+        cursor.execute(
+            "SELECT DISTINCT index_name FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = 'synonyms'"
+        )
+        return {row[0] for row in cursor.fetchall()}
+    cursor.execute("PRAGMA index_list(synonyms)")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def ensure_schema():
+    """
+    Creates the synonyms table if it does not exist yet and adds the
+    stem columns to tables created by older versions.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(_MYSQL_SCHEMA if DB_BACKEND == "mysql" else _SQLITE_SCHEMA)
+        columns = _existing_columns(cursor)
+        for name, col_type in _STEM_COLUMNS.items():
+            if name not in columns:
+                cursor.execute(f"ALTER TABLE synonyms ADD COLUMN {name} {col_type}")
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def ensure_indexes():
+    """
+    Cleans legacy rows (stray whitespace, self pairs, exact duplicates) and
+    creates the lookup indexes plus the unique (word, synonym_word) index
+    that makes re-imports idempotent.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        existing = _existing_indexes(cursor)
+        if "uq_synonyms_pair" not in existing:
+            conn.begin()
+            for query in _CLEANUP_QUERIES:
+                cursor.execute(query)
+        for name, (columns, unique) in _INDEXES.items():
+            if name not in existing:
+                kind = "UNIQUE INDEX" if unique else "INDEX"
+                cursor.execute(f"CREATE {kind} {name} ON synonyms ({columns})")
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def fetch_synonyms_bulk(words):
+    """
+    Looks up synonyms for a whole token list in one round-trip per chunk.
+    Matches both directions (word -> synonym AND synonym -> word), on the
+    surface forms as well as the precomputed stems, so stemmed tokens from
+    preprocess_text() find their synonyms too. Stems go through the same
+    resolve_stems() filter as the synonym classes.
+    Returns {word: set(synonyms)} with an entry for every requested word.
+    """
+    unique_words = list(dict.fromkeys(w for w in words if w))
+    synonym_map = {w: set() for w in unique_words}
+    if not unique_words:
+        return synonym_map
+
+    rows = []
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        for chunk in _chunks(unique_words):
+            marks = ", ".join(["%s"] * len(chunk))
+            query = f"""
+                SELECT word, synonym_word, word_stem, synonym_stem FROM synonyms
+                WHERE word IN ({marks}) OR synonym_word IN ({marks})
+            """
+            params = tuple(chunk) * 2
+            stems = [w for w in chunk if is_linkable_stem(w)]
+            if stems:
+                stem_marks = ", ".join(["%s"] * len(stems))
+                query += f" OR word_stem IN ({stem_marks}) OR synonym_stem IN ({stem_marks})"
+                params += tuple(stems) * 2
+            cursor.execute(_sql(query), params)
+            rows.extend(cursor.fetchall())
+        cursor.close()
+    finally:
+        conn.close()
+
+    stems = resolve_stems(rows)
+    for word, synonym, word_stem, synonym_stem in rows:
+        left = {word} | ({word_stem} & stems.keys())
+        right = {synonym} | ({synonym_stem} & stems.keys())
+        for key in left & synonym_map.keys():
+            synonym_map[key].update(right)
+        for key in right & synonym_map.keys():
+            synonym_map[key].update(left)
+
+    return synonym_map
+
+
+def fetch_synonyms(word):
+    """
+    Single-word convenience wrapper around fetch_synonyms_bulk().
+    """
+    return fetch_synonyms_bulk([word]).get(word, set())
+
+
+def fetch_all_pairs():
+    """
+    Returns every (word, synonym_word, word_stem, synonym_stem) row in one scan.
+    Used to build the synonym graph / equivalence classes.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT word, synonym_word, word_stem, synonym_stem FROM synonyms")
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return rows
+
+
+def fetch_table_version():
+    """
+    Returns a cheap (row count, max id) stamp of the table; it changes whenever
+    rows are imported or cleaned up, so long-lived caches can tell they are stale.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT COUNT(*), MAX(id) FROM synonyms")
+        version = tuple(cursor.fetchone())
+        cursor.close()
+    finally:
+        conn.close()
+    return version
+
+
+def fetch_pair_keys():
+    """
+    Returns every stored pair as an order-independent (min, max) tuple,
+    used to skip symmetric duplicates that the unique index cannot see.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT word, synonym_word FROM synonyms")
+        keys = {tuple(sorted(row)) for row in cursor.fetchall()}
+        cursor.close()
+    finally:
+        conn.close()
+    return keys
+
+
+def upsert_synonym_rows(rows, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Inserts (csv_id, word, synonym_word, word_stem, synonym_stem) rows in
+    large executemany() batches, ignoring pairs that already exist.
+    Accepts any iterable (e.g. a generator streaming a CSV).
+    Returns the number of rows actually written.
+    """
+    verb = "INSERT IGNORE" if DB_BACKEND == "mysql" else "INSERT OR IGNORE"
+    query = _sql(
+        f"{verb} INTO synonyms (csv_id, word, synonym_word, word_stem, synonym_stem) "
+        "VALUES (%s, %s, %s, %s, %s)"
+    )
+
+    written = 0
+    conn = get_db_connection()
+    try:
+        conn.begin()
+        cursor = conn.cursor()
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                cursor.executemany(query, batch)
+                written += max(cursor.rowcount, 0)
+                batch = []
+        if batch:
+            cursor.executemany(query, batch)
+            written += max(cursor.rowcount, 0)
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+    return written
+
+
+def fetch_all_rows():
+    """
+    Returns every (id, word, synonym_word, word_stem, synonym_stem) row, oldest first.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT id, word, synonym_word, word_stem, synonym_stem FROM synonyms ORDER BY id")
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return rows
+
+
+def rewrite_synonym_rows(updates, delete_ids, batch_size=IMPORT_BATCH_SIZE):
+    """
+    Applies a cleanup pass in one transaction: deletes rows by id, then rewrites
+    (word, synonym_word, word_stem, synonym_stem, id) rows in place.
+    Deleting first lets a row take over the cleaned form of a removed duplicate.
+    """
+    update_query = _sql(
+        "UPDATE synonyms SET word = %s, synonym_word = %s, word_stem = %s, synonym_stem = %s WHERE id = %s"
+    )
+    with get_db_connection() as conn:
+        conn.begin()
+        cursor = conn.cursor()
+        for chunk in _chunks(list(delete_ids)):
+            marks = ", ".join(["%s"] * len(chunk))
+            cursor.execute(_sql(f"DELETE FROM synonyms WHERE id IN ({marks})"), tuple(chunk))
+        for batch in _chunks(list(updates), batch_size):
+            cursor.executemany(update_query, batch)
+        cursor.close()
+
+
+def fetch_rows(limit=5):
+    """
+    Returns the first raw rows of the table (id, csv_id, word, synonym_word).
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(_sql("SELECT id, csv_id, word, synonym_word FROM synonyms LIMIT %s"), (limit,))
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return rows
+
+
+def find_rows(word):
+    """
+    Returns every raw row where the word appears on either side of the pair.
+    """
+    conn = get_db_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            _sql("SELECT id, csv_id, word, synonym_word FROM synonyms WHERE word = %s OR synonym_word = %s"),
+            (word, word)
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+    return rows
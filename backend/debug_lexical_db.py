@@ -1,26 +1,18 @@
 # backend/debug_lexical_db.py
 import sys
 import os
-import mysql.connector
 
-# Setup path to find db_config
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'database')))
-# If that fails, try the direct relative import if db_config is in backend/database
-try:
-    from database.db_config import get_db_connection
-except ImportError:
-    # Fallback if running from backend root
-    from database.db_config import get_db_connection
+# Setup path to find the database package (backend/database)
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from database.db_config import DB_BACKEND
+from database.synonym_store import fetch_rows, find_rows
 
 def check_database():
-    print("--- 🔍 INSPECTING DATABASE CONTENT ---")
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    print(f"--- 🔍 INSPECTING DATABASE CONTENT ({DB_BACKEND}) ---")
 
     # 1. Check the first 5 rows to see if they are readable or just '????'
     print("\n1. First 5 Rows in Database:")
-    cursor.execute("SELECT * FROM synonyms LIMIT 5")
-    rows = cursor.fetchall()
+    rows = fetch_rows(limit=5)
     for row in rows:
         print(f"   ID: {row[1]} | Word: {row[2]} | Synonym: {row[3]}")
 
@@ -28,16 +20,12 @@ def check_database():
     search_word = "ආහාර"
     print(f"\n2. Searching for '{search_word}'...")
     
-    query = "SELECT * FROM synonyms WHERE word = %s OR synonym_word = %s"
-    cursor.execute(query, (search_word, search_word))
-    results = cursor.fetchall()
+    results = find_rows(search_word)
     
     if results:
         print(f"   ✅ FOUND IT! Linked to: {results}")
     else:
         print(f"   ❌ NOT FOUND. '{search_word}' is not in your database.")
-        
-    conn.close()
 
 if __name__ == "__main__":
     check_database()
\ No newline at end of file
@@ -0,0 +1,83 @@
+# backend/debug_startup.py
+# Import-time profile report: how long each subsystem takes to import (cold, in a
+# fresh interpreter) and which imports dominate. Optionally times warmup().
+#
+#   python debug_startup.py            -> import profile only
+#   python debug_startup.py --warmup   -> also load LaBSE and run warmup()
+#   python debug_startup.py --save-snapshot models/labse  -> write a local model snapshot
+import argparse
+import subprocess
+import sys
+import os
+
+TARGETS = [
+    "modules.ParaphraseDetection.preprocessor",
+    "modules.ParaphraseDetection.lexical_analyzer",
+    "modules.ParaphraseDetection.fingerprint",
+    "modules.ParaphraseDetection.semantic_analyzer",
+    "modules.ParaphraseDetection.plagiarism_engine",
+    "modules.web_scraper",
+]
+
+def profile_import(module, top=5):
+    """
+    Runs 'python -X importtime -c "import <module>"' and parses the report.
+    Returns (total_seconds, [(cumulative_seconds, imported_name), ...]).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        # Format: "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative) / 1e6, name.rstrip()))
+
+    # -X importtime prints children *before* their parent, indented one level deeper
+    indent = lambda name: len(name) - len(name.lstrip())
+    target = next(i for i, (_, name) in enumerate(rows) if name.strip() == module)
+    children = []
+    for cumulative, name in reversed(rows[:target]):
+        if indent(name) <= indent(rows[target][1]):
+            break
+        if indent(name) == indent(rows[target][1]) + 2:
+            children.append((cumulative, name.strip()))
+
+    return rows[target][0], sorted(children, reverse=True)[:top]
+
+def print_report():
+    print("--- ⏱️ IMPORT-TIME PROFILE (fresh interpreter per module) ---")
+    for module in TARGETS:
+        try:
+            total, heaviest = profile_import(module)
+        except ImportError as e:
+            print(f"\n❌ {module}: {e}")
+            continue
+        status = "✅" if total < 1.0 else "🐢"
+        print(f"\n{status} {module}: {total:.3f}s")
+        for cumulative, name in heaviest:
+            print(f"   {cumulative:7.3f}s  {name}")
+    print("\n--------------------------------")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup / import-time profile report.")
+    parser.add_argument("--warmup", action="store_true", help="Also load the model and time warmup()")
+    parser.add_argument("--save-snapshot", metavar="FOLDER", help="Save the loaded model to FOLDER")
+    args = parser.parse_args()
+
+    print_report()
+
+    if args.warmup or args.save_snapshot:
+        from modules.ParaphraseDetection.plagiarism_engine import warmup
+        from modules.ParaphraseDetection.model_loader import save_snapshot
+        warmup()
+        if args.save_snapshot:
+            save_snapshot(args.save_snapshot)
+            print(f"   Start with PLAGIARISM_MODEL={args.save_snapshot} to load from the snapshot.")
@@ -0,0 +1,266 @@
+# backend/modules/ParaphraseDetection/fingerprint.py
+# Winnowing (k-gram fingerprint) index for the verbatim-copy fast path.
+#
+# Near-verbatim copies do not need LaBSE: both documents are reduced to the
+# preprocess_text() token stream, every k consecutive tokens are hashed, and the
+# winnowing algorithm keeps the minimum hash of each window of w hashes.
+# Any shared run of at least (k + w - 1) tokens is guaranteed to share a fingerprint,
+# and matching is a dictionary lookup per fingerprint, i.e. linear in document length.
+import zlib
+from .preprocessor import preprocess_text
+
+K_GRAM = 5              # tokens per hashed shingle
+WINDOW = 4              # hashes per winnowing window
+MAX_GAP = K_GRAM        # tokens an edit may break on the same alignment before a span is split
+MAX_DRIFT = 2           # inserted/deleted words tolerated between two neighbouring spans
+COVERAGE_THRESHOLD = 0.8  # share of a sentence's tokens that must be covered to count as copied
+
+
+def sentence_offsets(text, sentences):
+    """
+    Locates each (already split) sentence in the original text.
+    Returns a list of (start, end) character offsets.
+    """
+    offsets = []
+    cursor = 0
+    for sentence in sentences:
+        start = text.find(sentence, cursor)
+        if start < 0:
+            start = cursor
+        end = start + len(sentence)
+        offsets.append((start, end))
+        cursor = end
+    return offsets
+
+
+def _hash_kgram(tokens):
+    # crc32 is deterministic across processes (unlike hash()), so fingerprints can be cached
+    return zlib.crc32("\x1f".join(tokens).encode('utf-8'))
+
+
+def winnow(hashes, window=WINDOW):
+    """
+    Selects (hash, position) fingerprints: the rightmost minimum of every window,
+    recorded once per position.
+    """
+    if not hashes:
+        return []
+    if len(hashes) <= window:
+        pos = min(range(len(hashes)), key=lambda i: (hashes[i], -i))
+        return [(hashes[pos], pos)]
+
+    fingerprints = []
+    last_pos = -1
+    for start in range(len(hashes) - window + 1):
+        pos = start
+        for i in range(start + 1, start + window):
+            if hashes[i] <= hashes[pos]:
+                pos = i
+        if pos != last_pos:
+            fingerprints.append((hashes[pos], pos))
+            last_pos = pos
+    return fingerprints
+
+
+def fingerprint_document(text, sentences):
+    """
+    Tokenizes every sentence with preprocess_text() and fingerprints the
+    whole token stream (k-grams may cross sentence boundaries).
+    """
+    tokens = []
+    token_sentence = []
+    sentence_starts = []
+    for idx, sentence in enumerate(sentences):
+        sentence_tokens = preprocess_text(sentence)
+        sentence_starts.append(len(tokens))
+        tokens.extend(sentence_tokens)
+        token_sentence.extend([idx] * len(sentence_tokens))
+
+    hashes = [_hash_kgram(tokens[i:i + K_GRAM]) for i in range(len(tokens) - K_GRAM + 1)]
+
+    return {
+        "sentences": sentences,
+        "offsets": sentence_offsets(text, sentences),
+        "tokens": tokens,
+        "token_sentence": token_sentence,
+        "sentence_starts": sentence_starts,
+        "fingerprints": winnow(hashes),
+    }
+
+
+def sentence_tokens(doc, start, stop):
+    """
+    Returns the preprocessed tokens of sentences [start, stop) without re-running preprocess_text().
+    """
+    starts = doc["sentence_starts"]
+    bounds = starts[start:stop + 1] if stop < len(starts) else starts[start:] + [len(doc["tokens"])]
+    return [doc["tokens"][a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+def _merge_spans(matches):
+    """
+    Turns (student_pos, source_pos) fingerprint hits into maximal spans.
+    Hits on the same alignment (source_pos - student_pos) that are at most
+    MAX_GAP tokens apart are merged, which tolerates single-word substitutions;
+    neighbouring spans whose alignment drifts by at most MAX_DRIFT are then
+    joined, which tolerates a few inserted or deleted words.
+    Returns (student_start, student_end, source_start, source_end, shifts) where
+    shifts is the set of alignments merged into the span.
+    """
+    by_alignment = {}
+    for stu_pos, src_pos in matches:
+        by_alignment.setdefault(src_pos - stu_pos, []).append(stu_pos)
+
+    runs = []
+    for shift, positions in by_alignment.items():
+        positions.sort()
+        start = positions[0]
+        end = start + K_GRAM
+        for pos in positions[1:]:
+            if pos <= end + MAX_GAP:
+                end = max(end, pos + K_GRAM)
+            else:
+                runs.append((start, end, shift))
+                start, end = pos, pos + K_GRAM
+        runs.append((start, end, shift))
+    runs.sort()
+
+    spans = []
+    for start, end, shift in runs:
+        if spans:
+            p_start, p_end, p_src_start, p_src_end, p_shifts = spans[-1]
+            p_shift = p_src_end - p_end
+            if start <= p_end + MAX_GAP and abs(shift - p_shift) <= MAX_DRIFT and start + shift >= p_src_start:
+                p_shifts.add(shift)
+                spans[-1] = (p_start, max(p_end, end), p_src_start, max(p_src_end, end + shift), p_shifts)
+                continue
+        spans.append((start, end, start + shift, end + shift, {shift}))
+    return spans
+
+
+def _extend_span(student_tokens, source_tokens, start, end, src_start, src_end):
+    """
+    Winnowing only guarantees one fingerprint per window, so up to WINDOW - 1
+    tokens at either edge of a copied run can be missed. Grow the span token by
+    token while both sides keep agreeing.
+    """
+    end = min(end, len(student_tokens))
+    src_end = min(src_end, len(source_tokens))
+    while start > 0 and src_start > 0 and student_tokens[start - 1] == source_tokens[src_start - 1]:
+        start -= 1
+        src_start -= 1
+    while end < len(student_tokens) and src_end < len(source_tokens) and student_tokens[end] == source_tokens[src_end]:
+        end += 1
+        src_end += 1
+    return start, end, src_start, src_end
+
+
+class FingerprintIndex:
+    """
+    In-memory winnowing index over any number of source documents
+    (local files, scraped pages ...), keyed by a caller-chosen doc_id.
+    """
+
+    def __init__(self):
+        self.documents = {}
+        self._postings = {}
+
+    def add_document(self, doc_id, text, sentences):
+        return self.add_fingerprinted(doc_id, fingerprint_document(text, sentences))
+
+    def add_fingerprinted(self, doc_id, doc):
+        """
+        Indexes a document already produced by fingerprint_document()
+        (e.g. a page shared between concurrent requests).
+        """
+        self.documents[doc_id] = doc
+        for h, pos in doc["fingerprints"]:
+            self._postings.setdefault(h, []).append((doc_id, pos))
+        return doc
+
+    def find_overlaps(self, student_doc):
+        """
+        Returns {doc_id: [span, ...]} where every span reports token offsets,
+        character offsets (sentence-aligned) and the sentences involved on both sides.
+        """
+        hits = {}
+        for h, stu_pos in student_doc["fingerprints"]:
+            for doc_id, src_pos in self._postings.get(h, ()):
+                hits.setdefault(doc_id, []).append((stu_pos, src_pos))
+
+        overlaps = {}
+        for doc_id, matches in hits.items():
+            source_doc = self.documents[doc_id]
+            spans = []
+            for *span, shifts in _merge_spans(matches):
+                start, end, src_start, src_end = _extend_span(
+                    student_doc["tokens"], source_doc["tokens"], *span
+                )
+                # Edge extension keeps the alignment of the edge it grew from
+                shifts |= {src_start - start, src_end - end}
+                stu_sents = (student_doc["token_sentence"][start], student_doc["token_sentence"][end - 1])
+                src_sents = (source_doc["token_sentence"][src_start], source_doc["token_sentence"][src_end - 1])
+                spans.append({
+                    "student_tokens": (start, end),
+                    "source_tokens": (src_start, src_end),
+                    "student_chars": (student_doc["offsets"][stu_sents[0]][0], student_doc["offsets"][stu_sents[1]][1]),
+                    "source_chars": (source_doc["offsets"][src_sents[0]][0], source_doc["offsets"][src_sents[1]][1]),
+                    "student_sentences": stu_sents,
+                    "source_sentences": src_sents,
+                    "shifts": sorted(shifts),
+                })
+            spans.sort(key=lambda s: s["student_tokens"])
+            overlaps[doc_id] = spans
+        return overlaps
+
+
+def explain_sentences(student_doc, source_doc, spans, threshold=COVERAGE_THRESHOLD):
+    """
+    Marks which student sentences are (near-)verbatim copies of the source.
+    Returns {student_sentence_index: match dict} for sentences whose tokens are
+    covered by fingerprint spans at or above the threshold.
+    """
+    token_sentence = student_doc["token_sentence"]
+    sentence_sizes = {}
+    for idx in token_sentence:
+        sentence_sizes[idx] = sentence_sizes.get(idx, 0) + 1
+
+    # aligned[student token position] -> source sentence it was copied from.
+    # A span can bridge a short original passage (hits on the same alignment up to
+    # MAX_GAP tokens apart are merged), so only positions whose token actually equals
+    # the source token under one of the span's alignments count as copied.
+    student_tokens = student_doc["tokens"]
+    source_tokens = source_doc["tokens"]
+    aligned = {}
+    for span in spans:
+        start, end = span["student_tokens"]
+        src_start, src_end = span["source_tokens"]
+        for pos in range(start, end):
+            if pos in aligned:
+                continue
+            for shift in span["shifts"]:
+                src_pos = pos + shift
+                if src_start <= src_pos < src_end and student_tokens[pos] == source_tokens[src_pos]:
+                    aligned[pos] = source_doc["token_sentence"][src_pos]
+                    break
+
+    # covered[sentence] -> {source_sentence: covered token count}
+    covered = {}
+    for pos, src_sent in aligned.items():
+        per_source = covered.setdefault(token_sentence[pos], {})
+        per_source[src_sent] = per_source.get(src_sent, 0) + 1
+
+    explained = {}
+    for sent_idx, per_source in covered.items():
+        coverage = sum(per_source.values()) / sentence_sizes[sent_idx]
+        if coverage < threshold:
+            continue
+        src_sent = max(per_source, key=per_source.get)
+        explained[sent_idx] = {
+            "student_sentence": student_doc["sentences"][sent_idx],
+            "source_sentence": source_doc["sentences"][src_sent],
+            "coverage": round(coverage * 100, 2),
+            "student_offsets": student_doc["offsets"][sent_idx],
+            "source_offsets": source_doc["offsets"][src_sent],
+        }
+    return explained
@@ -1,46 +1,32 @@
 # modules/ParaphraseDetection/lexical_analyzer.py
 import sys
 import os
-import mysql.connector
+from collections import Counter
 
-# Add the backend folder to the system path to find 'database/db_config.py'
+# Add the backend folder to the system path to find 'database/synonym_store.py'
 # We go up two levels: ParaphraseDetection -> modules -> backend
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
-from database.db_config import get_db_connection
+from database.db_config import DB_ERRORS
+from database.synonym_store import fetch_synonyms_bulk
+from .synonym_graph import get_synonym_classes
 
-def get_synonyms_from_db(word):
+def get_synonyms_for_tokens(tokens):
     """
-    Fetches all synonyms for a given word from the MySQL database.
-    Checks both 'word' and 'synonym_word' columns.
+    Fetches synonyms for a whole token list in a single pooled round-trip.
+    Returns {token: set(synonyms)}; on DB failure every token maps to an empty set.
     """
-    synonyms = set()
-    conn = None
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Check both directions: Word -> Synonym AND Synonym -> Word
-        query = """
-            SELECT synonym_word FROM synonyms WHERE word = %s
-            UNION
-            SELECT word FROM synonyms WHERE synonym_word = %s
-        """
-        cursor.execute(query, (word, word))
-        results = cursor.fetchall()
-        
-        for row in results:
-            if row[0]:
-                # CRITICAL FIX: .strip() removes invisible spaces/newlines
-                clean_word = row[0].strip()
-                synonyms.add(clean_word)
-                
-    except mysql.connector.Error as err:
+        return fetch_synonyms_bulk(tokens)
+    except DB_ERRORS + (TimeoutError,) as err:
         print(f"⚠️ DB Error: {err}")
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
-            
-    return synonyms
+        return {t: set() for t in tokens}
+
+def get_synonyms_from_db(word):
+    """
+    Fetches all synonyms for a given word from the database.
+    Checks both 'word' and 'synonym_word' columns.
+    """
+    return get_synonyms_for_tokens([word]).get(word, set())
 
 def calculate_lexical_similarity(tokens1, tokens2):
     """
@@ -53,30 +39,62 @@ def calculate_lexical_similarity(tokens1, tokens2):
     match_count = 0
     # Create a copy of tokens2 so we don't accidentally modify the original list
     temp_tokens2 = list(tokens2)
+
+    # Precomputed synonym classes: synonymy (including multi-hop) is one integer comparison
+    class_ids = get_synonym_classes()
+    temp_classes2 = [class_ids.get(w) for w in temp_tokens2]
     
     for word1 in tokens1:
         # 1. Direct Match (Exact word)
         if word1 in temp_tokens2:
             match_count += 1
-            temp_tokens2.remove(word1) # Remove so we don't count it twice
+            idx = temp_tokens2.index(word1)
+            del temp_tokens2[idx] # Remove so we don't count it twice
+            del temp_classes2[idx]
             continue
             
-        # 2. Synonym Match (Check Database)
-        synonyms = get_synonyms_from_db(word1)
-        found_synonym = False
-        
-        for syn in synonyms:
-            if syn in temp_tokens2:
-                match_count += 1
-                temp_tokens2.remove(syn)
-                found_synonym = True
-                # Success message to confirm it worked
-                print(f"   ✅ Synonym Matched: '{word1}' == '{syn}'")
-                break
-        
-        if not found_synonym:
-            pass # No match found
+        # 2. Synonym Match (Same synonym class)
+        class_id = class_ids.get(word1)
+        if class_id is None:
+            continue # Word has no known synonyms
+
+        if class_id in temp_classes2:
+            idx = temp_classes2.index(class_id)
+            match_count += 1
+            # Success message to confirm it worked
+            print(f"   ✅ Synonym Matched: '{word1}' == '{temp_tokens2[idx]}'")
+            del temp_tokens2[idx]
+            del temp_classes2[idx]
             
     # Calculate Score: Matches / Length of the longer sentence
     max_len = max(len(tokens1), len(tokens2))
-    return match_count / max_len if max_len > 0 else 0
\ No newline at end of file
+    return match_count / max_len if max_len > 0 else 0
+
+def calculate_lexical_matrix(token_lists1, token_lists2):
+    """
+    Lexical similarity for every (tokens1, tokens2) pair at once.
+    Each token is replaced by its synonym class id (or itself if it has none),
+    so the greedy matching above reduces to a multiset intersection, computed
+    through an inverted index so only pairs that share a token cost anything.
+    Returns a len(token_lists1) x len(token_lists2) list of scores in 0.0-1.0.
+    """
+    class_ids = get_synonym_classes()
+
+    # key -> [(column, count), ...] over the second list
+    postings = {}
+    for col, tokens in enumerate(token_lists2):
+        for key, count in Counter(class_ids.get(t, t) for t in tokens).items():
+            postings.setdefault(key, []).append((col, count))
+    lens2 = [len(tokens) for tokens in token_lists2]
+
+    matrix = []
+    for tokens1 in token_lists1:
+        row = [0.0] * len(token_lists2)
+        if tokens1:
+            len1 = len(tokens1)
+            for key, count in Counter(class_ids.get(t, t) for t in tokens1).items():
+                for col, count2 in postings.get(key, ()):
+                    row[col] += min(count, count2)
+            row = [matches / max(len1, len2) if len2 else 0.0 for matches, len2 in zip(row, lens2)]
+        matrix.append(row)
+    return matrix
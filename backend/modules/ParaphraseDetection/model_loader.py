@@ -0,0 +1,60 @@
+# backend/modules/ParaphraseDetection/model_loader.py
+# Lazy, shared loader for the LaBSE model.
+#
+# torch + sentence_transformers take seconds to import and the model takes far longer
+# to load, so nothing heavy happens at import time. The first caller of get_model()
+# pays the cost once; server.py calls warmup() at startup so real requests don't.
+import os
+import threading
+from ..admission import PrioritySemaphore
+
+# A Hub id, or a local folder written by model.save() (a pre-downloaded snapshot
+# skips the Hub round-trips on every start).
+MODEL_NAME_OR_PATH = os.getenv("PLAGIARISM_MODEL", "sentence-transformers/LaBSE")
+
+# Global cap on concurrent encode() calls across all requests. Pair checks
+# (interactive) take a slot before internet scans (batch) do, but while scans wait
+# at least one in every ENCODER_BATCH_EVERY slots goes to them.
+MAX_ENCODERS = int(os.getenv("PLAGIARISM_MAX_ENCODERS", "2"))
+ENCODER_BATCH_EVERY = int(os.getenv("PLAGIARISM_ENCODER_BATCH_EVERY", "4"))
+encoder_slots = PrioritySemaphore("encoder", MAX_ENCODERS, batch_every=ENCODER_BATCH_EVERY)
+
+_model = None
+_lock = threading.Lock()
+
+
+def get_model():
+    """
+    Returns the shared SentenceTransformer, loading it on first use.
+    """
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                from sentence_transformers import SentenceTransformer
+                print("⏳ Loading AI Model (LaBSE)... This might take a minute...")
+                _model = SentenceTransformer(MODEL_NAME_OR_PATH)
+                print("✅ AI Model Loaded Successfully!")
+    return _model
+
+
+def encode(sentences, interactive=False, **kwargs):
+    """
+    model.encode() under the global encoder cap.
+    """
+    model = get_model()
+    with encoder_slots.slot(high=interactive):
+        return model.encode(sentences, **kwargs)
+
+
+def is_model_loaded():
+    return _model is not None
+
+
+def save_snapshot(folder):
+    """
+    Writes the loaded model to a local folder; point PLAGIARISM_MODEL at it
+    to start from the snapshot instead of the Hub.
+    """
+    get_model().save(folder)
+    print(f"💾 Model snapshot saved to {folder}")
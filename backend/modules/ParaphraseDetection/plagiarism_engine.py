@@ -1,16 +1,41 @@
 # backend/modules/ParaphraseDetection/plagiarism_engine.py
 
-import torch
-from sentence_transformers import SentenceTransformer, util
-from .lexical_analyzer import calculate_lexical_similarity
+# torch / sentence_transformers are imported inside the functions that need them
+# (see model_loader.py), so importing this module stays cheap.
+import os
+import time
+import hashlib
+from .model_loader import encode, get_model
+from .lexical_analyzer import calculate_lexical_similarity, calculate_lexical_matrix
 from .preprocessor import preprocess_text
+from .fingerprint import FingerprintIndex, fingerprint_document, explain_sentences, sentence_tokens
 from concurrent.futures import ThreadPoolExecutor
 from ..web_scraper import get_internet_resources, scrape_url_content
+from ..single_flight import SingleFlight
 
-# 1. Load the Big Brain (LaBSE) once when server starts
-print("⏳ Loading AI Model (LaBSE)... This might take a minute...")
-model = SentenceTransformer('sentence-transformers/LaBSE')
-print("✅ AI Model Loaded Successfully!")
+# --- LIMITS FOR LONG SUBMISSIONS (overridable from the environment) ---
+MAX_URL_WORKERS = int(os.getenv("PLAGIARISM_WORKERS", "7"))
+MAX_WEB_SENTENCES = 100                                                  # sentences compared per page
+MAX_PAGE_CHARS = int(os.getenv("PLAGIARISM_MAX_PAGE_CHARS", "200000"))   # scraped text kept per page
+SENTENCE_WINDOW = int(os.getenv("PLAGIARISM_SENTENCE_WINDOW", "64"))     # student sentences per window
+MIN_SENTENCE_WINDOW = 4
+ENCODE_BATCH_SIZE = int(os.getenv("PLAGIARISM_ENCODE_BATCH", "32"))
+MEMORY_BUDGET_MB = int(os.getenv("PLAGIARISM_MEMORY_BUDGET_MB", "512"))  # estimated working set cap, excluding the model
+# Per (web sentence, student sentence) cell: float64 semantic/lexical/final scores,
+# the High-Lexical mask and the transient Python lexical row it is built from.
+SCORE_CELL_BYTES = 64
+# Per student token in the fingerprint document: the token string, its sentence index,
+# k-gram hash and fingerprint share (~165 bytes measured with tracemalloc).
+STUDENT_TOKEN_BYTES = 176
+# Per reported match dict (one per student sentence per page at most; ~350-500 bytes measured).
+MATCH_BYTES = 512
+
+# --- HYBRID SCORING RULES (all scores are percentages) ---
+HIGH_LEXICAL_THRESHOLD = 80   # above this, the lexical score alone can carry the match
+SEMANTIC_WEIGHT = 0.7
+LEXICAL_WEIGHT = 0.3
+NEAR_MATCH_THRESHOLD = 50     # logged as a near match
+MATCH_THRESHOLD = 70          # counted as plagiarized
 
 def split_sentences(text):
     """
@@ -23,89 +48,173 @@ def split_sentences(text):
     sentences = [s.strip() for s in text.split('.') if len(s.strip()) > 10]
     return sentences
 
+def to_percent(scores):
+    """
+    0.0-1.0 similarity tensor -> float64 percentage rounded to 2 decimals.
+    """
+    import torch
+    return torch.round(scores.to(torch.float64) * 10000) / 100
+
+def hybrid_scores(semantic_scores, lexical_scores):
+    """
+    The hybrid formula over whole score matrices (percentages, same shape).
+    High-Lexical pairs take the max of both scores, all others the 0.7/0.3 blend.
+    Returns (final_scores, high_lexical_mask).
+    """
+    import torch
+    high_lexical = lexical_scores > HIGH_LEXICAL_THRESHOLD
+    blended = semantic_scores * SEMANTIC_WEIGHT + lexical_scores * LEXICAL_WEIGHT
+    final_scores = torch.where(high_lexical, torch.maximum(semantic_scores, lexical_scores), blended)
+    return torch.round(final_scores * 100) / 100, high_lexical
+
+def detection_mode(is_high_lexical):
+    return "High-Lexical" if is_high_lexical else "Hybrid"
+
 def check_paraphrase(source_text, suspicious_text):
     """
     Hybrid Detection: Combines LaBSE (Semantic) and Custom SQL (Lexical).
     """
-    
+    import torch
+    from sentence_transformers import util
+
     # --- STEP 1: PREPROCESSING ---
     source_tokens = preprocess_text(source_text)
     suspicious_tokens = preprocess_text(suspicious_text)
 
     # --- STEP 2: SMALL BRAIN (Lexical Analysis) ---
     lexical_ratio = calculate_lexical_similarity(source_tokens, suspicious_tokens)
-    lexical_score = round(lexical_ratio * 100, 2)
 
     # --- STEP 3: BIG BRAIN (Semantic Analysis) ---
-    embeddings1 = model.encode(source_text, convert_to_tensor=True)
-    embeddings2 = model.encode(suspicious_text, convert_to_tensor=True)
-    
-    cosine_score = util.pytorch_cos_sim(embeddings1, embeddings2)
-    semantic_score = round(cosine_score.item() * 100, 2)
-
-    # --- STEP 4: THE COMBINED SCORE ---
-    if lexical_score > 80:
-        final_score = max(semantic_score, lexical_score)
-        mode = "High-Lexical"
-    else:
-        final_score = (semantic_score * 0.7) + (lexical_score * 0.3)
-        mode = "Hybrid"
-
-    final_score = round(final_score, 2)
+    # One batched call, at interactive priority on the shared encoder
+    embeddings1, embeddings2 = encode([source_text, suspicious_text], interactive=True, convert_to_tensor=True)
+
+    semantic = to_percent(util.pytorch_cos_sim(embeddings1, embeddings2))
+    lexical = to_percent(torch.tensor([[lexical_ratio]], dtype=torch.float64, device=semantic.device))
+
+    # --- STEP 4: THE COMBINED SCORE (same 1x1 matrix path as the internet scan) ---
+    final, high_lexical = hybrid_scores(semantic, lexical)
 
     return {
-        "paraphrase_score": final_score,
-        "semantic_score": semantic_score,
-        "lexical_score": lexical_score,
-        "detection_mode": mode
+        "paraphrase_score": final.item(),
+        "semantic_score": semantic.item(),
+        "lexical_score": lexical.item(),
+        "detection_mode": detection_mode(high_lexical.item())
     }
 
 
-def process_single_url(url, input_sentences):
+def encode_sentences(sentences):
     """
-    PARALLEL WORKER: Processes a single website against all input sentences.
+    Encodes sentences in bounded batches so peak activation memory does not
+    grow with the number of sentences. Runs at batch priority on the shared encoder.
+    """
+    return encode(sentences, batch_size=ENCODE_BATCH_SIZE, convert_to_tensor=True)
+
+
+def plan_sentence_window(num_sources, student_doc=None):
+    """
+    Sizes a scan against MEMORY_BUDGET_MB using a byte count of its working set
+    (an estimate from the sizes below, not a runtime measurement; the model is excluded):
+      - student side, O(submission): its text and the fingerprint document
+        (tokens, hashes, fingerprints, offsets) of every sentence,
+      - per page: its text, sentence embeddings and up to one match per student sentence,
+      - per window: its embeddings and the window x page score matrices.
+    The window shrinks first, down to MIN_SENTENCE_WINDOW; if even that does not fit,
+    fewer pages are scanned. Returns (window_size, max_sources); max_sources is 0
+    when the submission does not fit next to a single page.
+    """
+    embed_bytes = get_model().get_sentence_embedding_dimension() * 4
+    budget = MEMORY_BUDGET_MB * 1024 * 1024
+
+    num_sentences = 0
+    student_bytes = 0
+    if student_doc is not None:
+        num_sentences = len(student_doc["sentences"])
+        text_chars = sum(len(sentence) for sentence in student_doc["sentences"])
+        # Raw text + split sentences (UCS-2 for Sinhala), then the fingerprint document
+        student_bytes = text_chars * 2 * 2 + len(student_doc["tokens"]) * STUDENT_TOKEN_BYTES
+
+    # Fixed cost per page: its text, sentence embeddings and its match list
+    per_source_bytes = MAX_PAGE_CHARS * 2 + MAX_WEB_SENTENCES * embed_bytes + num_sentences * MATCH_BYTES
+    # Per student sentence in a window: its embedding, plus one score column per page
+    per_cell_bytes = MAX_WEB_SENTENCES * SCORE_CELL_BYTES
+
+    def max_window(sources):
+        spare = budget - student_bytes - sources * per_source_bytes
+        return spare // (embed_bytes + sources * per_cell_bytes) if spare > 0 else 0
+
+    window = max_window(num_sources)
+    if window >= MIN_SENTENCE_WINDOW:
+        return int(min(window, SENTENCE_WINDOW)), num_sources
+
+    max_sources = num_sources
+    while max_sources > 0 and max_window(max_sources) < MIN_SENTENCE_WINDOW:
+        max_sources -= 1
+    print(f"⚠️ Memory budget of {MEMORY_BUDGET_MB}MB fits {max_sources} of {num_sources} pages")
+    return MIN_SENTENCE_WINDOW, max_sources
+
+
+# Concurrent requests for the same URL / page content share one scrape / one encode
+scrape_flight = SingleFlight("scrape")
+page_flight = SingleFlight("encode")
+
+
+def analyse_page(web_raw_content):
+    """
+    Request-independent work on one scraped page: sentence split, fingerprints,
+    tokens and embeddings of the first MAX_WEB_SENTENCES sentences.
+    """
+    all_web_sentences = split_sentences(web_raw_content)
+    web_sentences = all_web_sentences[:MAX_WEB_SENTENCES]
+    if not web_sentences:
+        return None
+
+    return {
+        "sentences": web_sentences,
+        "page_doc": fingerprint_document(web_raw_content, all_web_sentences),
+        "tokens": [preprocess_text(w_sent) for w_sent in web_sentences],
+        "embeddings": encode_sentences(web_sentences)
+    }
+
+
+def prepare_source(url, student_doc=None):
+    """
+    PARALLEL WORKER: Scrapes one website and keeps only what scoring needs:
+    the first MAX_WEB_SENTENCES sentences, their tokens and embeddings,
+    plus the fingerprint fast-path results.
+    Scraping is single-flighted per URL and page analysis per content hash.
     """
     try:
-        web_raw_content = scrape_url_content(url)
+        web_raw_content = scrape_flight.do(url, scrape_url_content, url)
         if not web_raw_content:
             return None
-            
-        web_sentences = split_sentences(web_raw_content)[:100]
-        plagiarized_sentences = []
-        
-        for s_sent in input_sentences:
-            best_match_score = 0
-            best_analysis = {}
-            
-            for w_sent in web_sentences:
-                analysis = check_paraphrase(w_sent, s_sent)
-                
-                if analysis["paraphrase_score"] > 50:
-                    print(f"🔍 Near Match at {url[:25]}... [{analysis['detection_mode']}]")
-                    print(f"   Score: {analysis['paraphrase_score']}% (Sem: {analysis['semantic_score']} | Lex: {analysis['lexical_score']})")
-
-                if analysis["paraphrase_score"] > best_match_score:
-                    best_match_score = analysis["paraphrase_score"]
-                    best_analysis = {
-                        "student_sentence": s_sent,
-                        "source_sentence": w_sent,
-                        "paraphrase_score": analysis["paraphrase_score"],
-                        "semantic_score": analysis["semantic_score"],
-                        "lexical_score": analysis["lexical_score"],
-                        "mode": analysis["detection_mode"]
-                    }
-            
-            if best_match_score >= 70:
-                plagiarized_sentences.append(best_analysis)
-
-        overall_score = (len(plagiarized_sentences) / len(input_sentences)) * 100
+        web_raw_content = web_raw_content[:MAX_PAGE_CHARS]
+
+        content_hash = hashlib.sha1(web_raw_content.encode('utf-8')).hexdigest()
+        page = page_flight.do(content_hash, analyse_page, web_raw_content)
+        # The raw page is no longer needed; only the bounded sentence list is kept
+        del web_raw_content
+        if page is None:
+            return None
+
+        # --- FAST PATH: Winnowing fingerprints (whole page, linear time) ---
+        explained = {}
+        matched_spans = []
+        if student_doc is not None:
+            page_index = FingerprintIndex()
+            page_doc = page_index.add_fingerprinted(url, page["page_doc"])
+            matched_spans = page_index.find_overlaps(student_doc).get(url, [])
+            explained = explain_sentences(student_doc, page_doc, matched_spans)
+            if explained:
+                print(f"🧬 Fingerprint Match at {url[:25]}... ({len(explained)} sentence(s) copied verbatim)")
 
         return {
             "url": url,
-            "overall_paraphrase_percentage": round(overall_score, 2),
-            "plagiarized_count": len(plagiarized_sentences),
-            "total_sentences": len(input_sentences),
-            "detailed_matches": plagiarized_sentences
+            "sentences": page["sentences"],
+            "tokens": page["tokens"],
+            "embeddings": page["embeddings"],
+            "explained": explained,
+            "matched_spans": matched_spans,
+            "matches": []
         }
 
     except Exception as e:
@@ -113,40 +222,241 @@ def process_single_url(url, input_sentences):
         return None
 
 
+def score_window(source, window_start, window_sentences, pending, pending_tokens, pending_embeddings,
+                 log_matches=True):
+    """
+    Scores one window of student sentences against one prepared source.
+    pending lists the absolute indices of the window sentences that were encoded
+    (pending_tokens / pending_embeddings are aligned with it); sentences this source
+    already explains through fingerprints are reported as such and never scored.
+    The hybrid formula runs over the (web x unexplained student) matrix; result
+    dicts are only built for the best match per student sentence if >= 70%.
+    """
+    import torch
+    from sentence_transformers import util
+
+    explained = source["explained"]
+    columns = [col for col, s_idx in enumerate(pending) if s_idx not in explained]
+
+    best = {}
+    if columns:
+        if len(columns) < len(pending):
+            pending_embeddings = pending_embeddings[columns]
+            pending_tokens = [pending_tokens[col] for col in columns]
+
+        semantic = to_percent(util.pytorch_cos_sim(source["embeddings"], pending_embeddings))
+        lexical = to_percent(torch.tensor(
+            calculate_lexical_matrix(source["tokens"], pending_tokens),
+            dtype=torch.float64, device=semantic.device
+        ))
+        final, high_lexical = hybrid_scores(semantic, lexical)
+
+        # Best web sentence per student sentence (argmax keeps the first of equal scores)
+        best_rows = final.argmax(dim=0)
+        best_scores = final.gather(0, best_rows.unsqueeze(0)).squeeze(0)
+        for col, (w_idx, score) in enumerate(zip(best_rows.tolist(), best_scores.tolist())):
+            best[pending[columns[col]]] = (col, w_idx, score)
+
+    for offset, s_sent in enumerate(window_sentences):
+        s_idx = window_start + offset
+
+        if s_idx in explained:
+            copy = explained[s_idx]
+            source["matches"].append({
+                "student_sentence": s_sent,
+                "source_sentence": copy["source_sentence"],
+                "paraphrase_score": copy["coverage"],
+                "semantic_score": None,
+                "lexical_score": copy["coverage"],
+                "mode": "Fingerprint",
+                "student_offsets": copy["student_offsets"],
+                "source_offsets": copy["source_offsets"]
+            })
+            continue
+
+        col, w_idx, best_match_score = best[s_idx]
+        if best_match_score <= NEAR_MATCH_THRESHOLD:
+            continue
+
+        semantic_score = semantic[w_idx, col].item()
+        lexical_score = lexical[w_idx, col].item()
+        mode = detection_mode(high_lexical[w_idx, col].item())
+
+        if log_matches:
+            print(f"🔍 Near Match at {source['url'][:25]}... [{mode}]")
+            print(f"   Score: {best_match_score}% (Sem: {semantic_score} | Lex: {lexical_score})")
+
+        if best_match_score >= MATCH_THRESHOLD:
+            source["matches"].append({
+                "student_sentence": s_sent,
+                "source_sentence": source["sentences"][w_idx],
+                "paraphrase_score": best_match_score,
+                "semantic_score": semantic_score,
+                "lexical_score": lexical_score,
+                "mode": mode
+            })
+
+
+def score_sources(sources, input_sentences, student_doc=None, window_size=None):
+    """
+    STREAMING SCORER: Walks the submission in fixed-size sentence windows.
+    Each window is tokenized and encoded once, compared against every source,
+    and then dropped, so long submissions degrade linearly instead of failing.
+    Sentences that every source already explains through fingerprints are not
+    encoded at all. Tokens are reused from the student's fingerprint document when given.
+    A source that fails is marked with "error" and skipped from then on, so one
+    bad page does not fail the whole scan.
+    """
+    if window_size is None:
+        window_size, _ = plan_sentence_window(len(sources), student_doc)
+    total = len(input_sentences)
+    if total > window_size:
+        print(f"📚 Long submission: {total} sentences in windows of {window_size}")
+
+    for window_start in range(0, total, window_size):
+        live = [source for source in sources if "error" not in source]
+        if not live:
+            break
+
+        window_sentences = input_sentences[window_start:window_start + window_size]
+        pending = [
+            window_start + offset for offset in range(len(window_sentences))
+            if any(window_start + offset not in source["explained"] for source in live)
+        ]
+
+        pending_tokens, pending_embeddings = [], None
+        if pending:
+            if student_doc is not None:
+                window_tokens = sentence_tokens(student_doc, window_start, window_start + len(window_sentences))
+                pending_tokens = [window_tokens[s_idx - window_start] for s_idx in pending]
+            else:
+                pending_tokens = [preprocess_text(input_sentences[s_idx]) for s_idx in pending]
+            pending_embeddings = encode_sentences([input_sentences[s_idx] for s_idx in pending])
+
+        for source in live:
+            try:
+                score_window(source, window_start, window_sentences, pending, pending_tokens, pending_embeddings)
+            except Exception as e:
+                print(f"⚠️ Error processing {source['url']}: {e}")
+                source["error"] = str(e)
+
+        del pending_tokens, pending_embeddings
+
+
+def build_url_report(source, total_sentences):
+    """
+    Converts a scored source into the per-URL report returned by the API.
+    """
+    plagiarized_sentences = source["matches"]
+    overall_score = (len(plagiarized_sentences) / total_sentences) * 100
+
+    return {
+        "url": source["url"],
+        "overall_paraphrase_percentage": round(overall_score, 2),
+        "plagiarized_count": len(plagiarized_sentences),
+        "total_sentences": total_sentences,
+        "detailed_matches": plagiarized_sentences,
+        "matched_spans": [
+            {"student_chars": span["student_chars"], "source_chars": span["source_chars"]}
+            for span in source["matched_spans"]
+        ]
+    }
+
+
+def process_single_url(url, input_sentences, student_doc=None):
+    """
+    Processes a single website against all input sentences.
+    If the student's fingerprints are given, near-verbatim copies are found first
+    with winnowing and only the remaining sentences go to the semantic engine.
+    """
+    source = prepare_source(url, student_doc)
+    if source is None:
+        return None
+    try:
+        score_sources([source], input_sentences, student_doc)
+    except Exception as e:
+        print(f"⚠️ Error processing {url}: {e}")
+        return None
+    if "error" in source:
+        return None
+    return build_url_report(source, len(input_sentences))
+
+
 def check_internet_plagiarism(student_text):
     """
-    MAIN WORKFLOW: Coordinates web discovery and multi-threaded sentence analysis.
+    MAIN WORKFLOW: Coordinates web discovery, multi-threaded scraping and
+    windowed sentence analysis.
     """
     input_sentences = split_sentences(student_text)
     if not input_sentences:
         return {"error": "Input text too short."}
 
-    all_search_tokens = []
+    # Only the first 10 distinct tokens feed the search query; stop early on long texts
+    unique_tokens = {}
     for sentence in input_sentences:
-        tokens = preprocess_text(sentence)
-        all_search_tokens.extend([t for t in tokens if len(t) > 2])
-    
-    unique_tokens = list(dict.fromkeys(all_search_tokens))
-    search_query = " ".join(unique_tokens[:10]) 
+        for t in preprocess_text(sentence):
+            if len(t) > 2:
+                unique_tokens.setdefault(t, None)
+        if len(unique_tokens) >= 10:
+            break
+    search_query = " ".join(list(unique_tokens)[:10])
+
+    # Fingerprint the submission once; every URL worker reuses it
+    student_doc = fingerprint_document(student_text, input_sentences)
 
     print(f"📡 Multi-threaded Search Discovery: {search_query}")
     candidate_urls = get_internet_resources(search_query, num_results=7)
-    
-    url_reports = []
 
-    with ThreadPoolExecutor(max_workers=7) as executor:
+    # Size the scan before scraping; over budget, only the top-ranked pages are kept
+    window_size = SENTENCE_WINDOW
+    if candidate_urls:
+        window_size, max_sources = plan_sentence_window(len(candidate_urls), student_doc)
+        if max_sources == 0:
+            return {"error": "Submission is too long to scan within the server's memory budget."}
+        candidate_urls = candidate_urls[:max_sources]
+
+    # 1. Scrape + encode pages in parallel (I/O bound)
+    with ThreadPoolExecutor(max_workers=MAX_URL_WORKERS) as executor:
         future_tasks = [
-            executor.submit(process_single_url, url, input_sentences)
+            executor.submit(prepare_source, url, student_doc)
             for url in candidate_urls
         ]
-        for future in future_tasks:
-            result = future.result()
-            if result:
-                url_reports.append(result)
+        sources = [future.result() for future in future_tasks]
+    sources = [s for s in sources if s]
+
+    # 2. Stream the submission through all pages, window by window
+    url_reports = []
+    if sources:
+        score_sources(sources, input_sentences, student_doc, window_size)
+        # A page that failed during scoring is dropped, like one that failed to scrape
+        url_reports = [build_url_report(source, len(input_sentences)) for source in sources if "error" not in source]
 
     url_reports.sort(
         key=lambda x: x['overall_paraphrase_percentage'],
         reverse=True
     )
 
-    return url_reports
\ No newline at end of file
+    return url_reports
+
+
+def warmup():
+    """
+    Pays every first-use cost up front: loads LaBSE, runs a dummy batch through
+    encode + scoring (allocates buffers / warms kernels), builds the synonym
+    classes and the preprocessor caches. Returns the time taken in seconds.
+    """
+    from .synonym_graph import get_synonym_classes
+
+    start = time.perf_counter()
+    dummy = ["ශ්‍රී ලංකාව ඉන්දියන් සාගරයේ පිහිටි දිවයිනකි"] * ENCODE_BATCH_SIZE
+    embeddings = encode_sentences(dummy)
+    tokens = [preprocess_text(dummy[0])] * len(dummy)
+    get_synonym_classes()
+    score_window(
+        {"url": "warmup", "sentences": dummy, "tokens": tokens, "embeddings": embeddings,
+         "explained": {}, "matches": []},
+        0, dummy, list(range(len(dummy))), tokens, embeddings, log_matches=False
+    )
+    elapsed = time.perf_counter() - start
+    print(f"🔥 Engine warmed up in {elapsed:.2f}s")
+    return elapsed
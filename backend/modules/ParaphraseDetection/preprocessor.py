@@ -2,7 +2,12 @@
 import os
 import re
 import unicodedata
-from sinling import SinhalaTokenizer, SinhalaStemmer # <--- NEW: Import Stemmer
+
+# sinling (Tokenizer + Stemmer) is imported on first use, and the tokenizer,
+# stemmer and stop-word set are built once and reused for every sentence.
+_tokenizer = None
+_stemmer = None
+_stop_words = None
 
 def normalize_sinhala(text):
     """
@@ -37,6 +42,36 @@ def load_stop_words():
     
     return stop_words
 
+def get_stop_words():
+    """
+    Cached stop-word set (the file is read once per process).
+    """
+    global _stop_words
+    if _stop_words is None:
+        _stop_words = frozenset(load_stop_words())
+    return _stop_words
+
+def get_tokenizer():
+    global _tokenizer
+    if _tokenizer is None:
+        from sinling import SinhalaTokenizer
+        _tokenizer = SinhalaTokenizer()
+    return _tokenizer
+
+def stem_word(word):
+    """
+    Returns the root form (stem) of a single word.
+    Falls back to the word itself if stemming fails.
+    """
+    global _stemmer
+    if _stemmer is None:
+        from sinling import SinhalaStemmer
+        _stemmer = SinhalaStemmer()
+    try:
+        return _stemmer.stem(word)[0]
+    except:
+        return word
+
 # --- THE INDUSTRIAL UPGRADE ---
 def preprocess_text(text, return_stems=True):
     """
@@ -52,26 +87,16 @@ def preprocess_text(text, return_stems=True):
     clean_text = re.sub(r'[^\u0D80-\u0DFF\s]', '', text)
     
     # 3. Tokenize (Split into words)
-    tokenizer = SinhalaTokenizer()
-    tokens = tokenizer.tokenize(clean_text)
+    tokens = get_tokenizer().tokenize(clean_text)
     
     # 4. Filter Stop Words
-    stop_words = load_stop_words()
+    stop_words = get_stop_words()
     filtered_tokens = [word for word in tokens if word not in stop_words]
     
     # 5. STEMMING (The New Logic) 🌿
     # This converts "ගුරුවරුන්ට" (to teachers) -> "ගුරුවරු" (teachers)
     if return_stems:
-        stemmer = SinhalaStemmer()
-        stemmed_tokens = []
-        for word in filtered_tokens:
-            try:
-                # Get the root word (stem)
-                stem = stemmer.stem(word)[0] 
-                stemmed_tokens.append(stem)
-            except:
-                # If stemming fails, keep original word
-                stemmed_tokens.append(word)
-        return stemmed_tokens
+        # Get the root word (stem); if stemming fails the original word is kept
+        return [stem_word(word) for word in filtered_tokens]
     
     return filtered_tokens
\ No newline at end of file
@@ -1,11 +1,8 @@
 # modules/ParaphraseDetection/semantic_analyzer.py
-from sentence_transformers import SentenceTransformer, util
+from .model_loader import encode
 
-# We load the AI model globally so it only loads ONCE when the server starts.
+# The AI model is shared with plagiarism_engine and loaded ONCE, on first use.
 # 'LaBSE' is excellent for supporting 100+ languages including Sinhala.
-print("⏳ Loading AI Model (LaBSE)... This might take a minute...")
-model = SentenceTransformer('sentence-transformers/LaBSE')
-print("✅ AI Model Loaded Successfully!")
 
 def calculate_semantic_similarity(text1, text2):
     """
@@ -15,10 +12,11 @@ def calculate_semantic_similarity(text1, text2):
     if not text1 or not text2:
         return 0.0
 
+    from sentence_transformers import util
+
     # 1. Convert text into "Embeddings" (Number lists representing meaning)
     # convert_to_tensor=True helps us do math on them quickly
-    embeddings1 = model.encode(text1, convert_to_tensor=True)
-    embeddings2 = model.encode(text2, convert_to_tensor=True)
+    embeddings1, embeddings2 = encode([text1, text2], interactive=True, convert_to_tensor=True)
 
     # 2. Calculate Cosine Similarity
     # This checks how close the two meanings are in vector space
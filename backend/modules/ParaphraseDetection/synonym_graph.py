@@ -0,0 +1,131 @@
+# backend/modules/ParaphraseDetection/synonym_graph.py
+# Precomputes synonym equivalence classes from the 'synonyms' table.
+#
+# The table only stores direct pairs (මව -> අම්මා, මව -> මාතාව), so a one-hop lookup
+# never links අම්මා <-> මාතාව. Here the pairs are treated as an undirected graph and
+# every connected component becomes one class with a compact integer id.
+# At request time a synonym check is then a single integer comparison.
+import sys
+import os
+import threading
+import time
+
+# We go up two levels: ParaphraseDetection -> modules -> backend
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from database.db_config import DB_ERRORS
+from database.synonym_store import fetch_all_pairs, fetch_table_version, resolve_stems
+
+# How often a running server checks the table for new imports (seconds)
+REFRESH_SECONDS = float(os.getenv("SYNONYM_REFRESH_SECONDS", "60"))
+# Backoff between rebuild attempts while the database is unreachable
+RETRY_MIN_SECONDS = 1
+RETRY_MAX_SECONDS = 60
+
+_class_ids = None
+_version = None
+_next_check = 0.0
+_retry_delay = RETRY_MIN_SECONDS
+_lock = threading.Lock()
+
+
+def build_synonym_classes(rows):
+    """
+    Union-find over (word, synonym_word, word_stem, synonym_stem) rows.
+    A stem joins its word's class only if resolve_stems() accepts it (long
+    enough and not shared by unrelated words).
+    Returns {term: class_id} with ids numbered 0..n-1.
+    """
+    parent = {}
+
+    def find(term):
+        root = term
+        while parent[root] != root:
+            root = parent[root]
+        # Path compression keeps later lookups O(1)-ish
+        while parent[term] != root:
+            parent[term], term = root, parent[term]
+        return root
+
+    def union(a, b):
+        parent.setdefault(a, a)
+        parent.setdefault(b, b)
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+
+    for word, synonym, _, _ in rows:
+        union(word, synonym)
+    for stem, word in resolve_stems(rows).items():
+        union(word, stem)
+
+    # Re-number roots to a dense 0..n-1 range
+    root_ids = {}
+    class_ids = {}
+    for term in parent:
+        class_ids[term] = root_ids.setdefault(find(term), len(root_ids))
+    return class_ids
+
+
+def load_synonym_classes():
+    """
+    Builds the class map from the database (one table scan) and caches it.
+    A failed build is not cached: the previous map (or none, i.e. exact-word
+    matching) stays in use and the build is retried on a later call, backing
+    off up to RETRY_MAX_SECONDS.
+    """
+    global _class_ids, _version, _next_check, _retry_delay
+    try:
+        # Stamp first: rows imported during the scan just trigger another rebuild
+        version = fetch_table_version()
+        class_ids = build_synonym_classes(fetch_all_pairs())
+    except DB_ERRORS + (TimeoutError,) as err:
+        print(f"⚠️ DB Error while building synonym classes (retrying in {_retry_delay}s): {err}")
+        _next_check = time.monotonic() + _retry_delay
+        _retry_delay = min(_retry_delay * 2, RETRY_MAX_SECONDS)
+        return _class_ids or {}
+
+    print(f"🧩 Synonym classes built: {len(set(class_ids.values()))} classes over {len(class_ids)} terms")
+    _class_ids, _version = class_ids, version
+    _next_check = time.monotonic() + REFRESH_SECONDS
+    _retry_delay = RETRY_MIN_SECONDS
+    return class_ids
+
+
+def _refresh():
+    """
+    Rebuilds the map if it was never built or the table changed since.
+    """
+    global _next_check
+    if _class_ids is not None:
+        try:
+            if fetch_table_version() == _version:
+                _next_check = time.monotonic() + REFRESH_SECONDS
+                return
+        except DB_ERRORS + (TimeoutError,) as err:
+            print(f"⚠️ DB Error while checking synonym classes: {err}")
+            _next_check = time.monotonic() + _retry_delay
+            return
+    load_synonym_classes()
+
+
+def get_synonym_classes():
+    """
+    Returns the cached {term: class_id} map, building it on first use and
+    rebuilding it when the table has changed (checked every REFRESH_SECONDS).
+    While a refresh runs, other threads keep using the current map.
+    """
+    if time.monotonic() >= _next_check and _lock.acquire(blocking=_class_ids is None):
+        try:
+            if time.monotonic() >= _next_check:
+                _refresh()
+        finally:
+            _lock.release()
+    return _class_ids if _class_ids is not None else {}
+
+
+def reload_synonym_classes():
+    """
+    Rebuilds the class map, e.g. after new synonyms have been imported.
+    """
+    with _lock:
+        return load_synonym_classes()
@@ -0,0 +1,194 @@
+# backend/modules/admission.py
+# Admission control for the API and global caps on expensive resources.
+#
+# - AdmissionController: a bounded FIFO queue + concurrency limit per request class.
+#   When the queue is full (or the wait would be too long) the caller is told to
+#   retry later instead of piling more threads / browsers onto the machine.
+# - PrioritySemaphore: a shared resource cap (e.g. the LaBSE encoder) where
+#   interactive work is served before batch work, with a guaranteed batch share.
+import collections
+import threading
+import time
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request cannot be admitted; retry_after is in seconds.
+    """
+
+    def __init__(self, name, reason, retry_after):
+        super().__init__(f"{name}: {reason}")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    At most max_concurrent requests run at once; up to max_queue more wait in
+    FIFO order for at most queue_timeout seconds. Everything beyond that is
+    rejected immediately.
+    """
+
+    def __init__(self, name, max_concurrent, max_queue, queue_timeout):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+
+        self._lock = threading.Lock()
+        self._running = 0
+        self._waiting = collections.deque()   # FIFO of threading.Event tickets
+
+        # Metrics
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._queue_times = collections.deque(maxlen=200)
+        self._service_times = collections.deque(maxlen=200)
+
+    def _retry_after(self):
+        # Rough drain time of the queue ahead of a new caller
+        service = (sum(self._service_times) / len(self._service_times)) if self._service_times else 1.0
+        backlog = len(self._waiting) + 1
+        return max(1, int(round(service * backlog / self.max_concurrent)))
+
+    def acquire(self):
+        """
+        Blocks until admitted; returns the time spent queued (seconds).
+        Raises AdmissionRejected if the queue is full or the wait times out.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            if self._running < self.max_concurrent and not self._waiting:
+                self._running += 1
+                self.admitted += 1
+                self._queue_times.append(0.0)
+                return 0.0
+            if len(self._waiting) >= self.max_queue:
+                self.rejected += 1
+                raise AdmissionRejected(self.name, "queue full", self._retry_after())
+            ticket = threading.Event()
+            self._waiting.append(ticket)
+
+        if not ticket.wait(self.queue_timeout):
+            with self._lock:
+                # The slot may have been handed over just as we timed out
+                if not ticket.is_set():
+                    self._waiting.remove(ticket)
+                    self.timed_out += 1
+                    raise AdmissionRejected(self.name, "queue wait timed out", self._retry_after())
+
+        queued = time.perf_counter() - start
+        with self._lock:
+            self.admitted += 1
+            self._queue_times.append(queued)
+        return queued
+
+    def release(self, service_time=None):
+        with self._lock:
+            if service_time is not None:
+                self._service_times.append(service_time)
+            if self._waiting:
+                # Hand the slot straight to the oldest waiter (FIFO fairness)
+                self._waiting.popleft().set()
+            else:
+                self._running -= 1
+
+    def stats(self):
+        with self._lock:
+            queue_times = list(self._queue_times)
+            return {
+                "running": self._running,
+                "waiting": len(self._waiting),
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "avg_queue_ms": round(1000 * sum(queue_times) / len(queue_times), 1) if queue_times else 0.0,
+                "max_queue_ms": round(1000 * max(queue_times), 1) if queue_times else 0.0,
+            }
+
+
+class PrioritySemaphore:
+    """
+    Counting semaphore with one FIFO queue per priority. Freed slots are handed
+    straight to the next waiter: interactive acquirers go first, but while batch
+    work is waiting, at least one in every batch_every grants goes to the oldest
+    batch waiter, so steady interactive traffic cannot starve batch work.
+    """
+
+    def __init__(self, name, slots, batch_every=4):
+        self.name = name
+        self.slots = max(1, slots)
+        self.batch_every = max(1, batch_every)
+        self._free = self.slots
+        self._lock = threading.Lock()
+        self._high = collections.deque()   # FIFO of threading.Event tickets
+        self._low = collections.deque()
+        self._high_streak = 0              # interactive grants in a row while batch waited
+
+        # Metrics
+        self.high_granted = 0
+        self.low_granted = 0
+
+    def _record_grant(self, high):
+        if high:
+            self.high_granted += 1
+            self._high_streak = self._high_streak + 1 if self._low else 0
+        else:
+            self.low_granted += 1
+            self._high_streak = 0
+
+    def acquire(self, high=False):
+        with self._lock:
+            if self._free and not self._high and not self._low:
+                self._free -= 1
+                self._record_grant(high)
+                return
+            ticket = threading.Event()
+            (self._high if high else self._low).append(ticket)
+        ticket.wait()
+
+    def release(self):
+        with self._lock:
+            batch_turn = self._low and (not self._high or self._high_streak >= self.batch_every - 1)
+            if batch_turn:
+                ticket = self._low.popleft()
+                self._record_grant(False)
+            elif self._high:
+                ticket = self._high.popleft()
+                self._record_grant(True)
+            else:
+                self._free += 1
+                return
+        # The slot passes straight to the waiter; _free is not touched
+        ticket.set()
+
+    def slot(self, high=False):
+        return _Slot(self, high)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "in_use": self.slots - self._free,
+                "slots": self.slots,
+                "high_waiting": len(self._high),
+                "batch_waiting": len(self._low),
+                "high_granted": self.high_granted,
+                "batch_granted": self.low_granted,
+            }
+
+
+class _Slot:
+    def __init__(self, semaphore, high):
+        self._semaphore = semaphore
+        self._high = high
+
+    def __enter__(self):
+        self._semaphore.acquire(self._high)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
@@ -0,0 +1,66 @@
+# backend/modules/single_flight.py
+# Single-flight coordinator: concurrent callers asking for the same key share ONE
+# in-progress computation and all receive its result (or its exception).
+#
+# When a whole class submits at once, every check_internet_plagiarism call tends to
+# discover the same URLs. Without this, each request launches its own Chromium,
+# scrapes the same page and encodes the same sentences.
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Deduplicates in-flight work by key. Nothing is cached: once a call finishes,
+    the next caller for that key starts fresh work.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                print(f"🤝 [{self.name}] {call.waiters} concurrent request(s) shared one result")
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            return {"executed": self.executed, "shared": self.shared, "in_flight": len(self._calls)}
@@ -1,19 +1,31 @@
-﻿import trafilatura
+﻿import os
 
-from ddgs import DDGS
-
-from playwright.sync_api import sync_playwright
+import threading
 
 import urllib3
 
 
 
+# trafilatura, ddgs and playwright are heavy; they are imported on first use
+
+# inside the functions below so importing this module stays cheap.
+
+
+
 # Suppress SSL/InsecureRequest warnings common on .gov.lk websites
 
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
 
+# Global cap on concurrently running Chromium instances, shared by every request
+
+MAX_BROWSERS = int(os.getenv("PLAGIARISM_MAX_BROWSERS", "3"))
+
+browser_slots = threading.BoundedSemaphore(MAX_BROWSERS)
+
+
+
 def get_internet_resources(query_text, num_results=7):
 
     """
@@ -30,6 +42,8 @@ def get_internet_resources(query_text, num_results=7):
 
     try:
 
+        from ddgs import DDGS
+
         with DDGS() as ddgs:
 
             # Fetch extra results to allow for filtering (max_results=15)
@@ -78,9 +92,15 @@ def scrape_url_content(url):
 
     try:
 
+        import trafilatura
+
+        from playwright.sync_api import sync_playwright
+
         # 1. DYNAMIC RENDERING: Use Playwright to execute JavaScript
 
-        with sync_playwright() as p:
+        # (waits for a free browser slot so bursts can't launch unbounded Chromiums)
+
+        with browser_slots, sync_playwright() as p:
 
             # Launch a headless browser (Chromium) to mimic a real user
 
@@ -3,20 +3,72 @@ from flask import Flask, request, jsonify
 from flask_cors import CORS
 import sys
 import os
+import time
+import threading
+from functools import wraps
 
 # Add the modules path so we can import your engine
 sys.path.append(os.path.dirname(__file__))
-from modules.ParaphraseDetection.plagiarism_engine import check_paraphrase, check_internet_plagiarism
+from modules.ParaphraseDetection.plagiarism_engine import (
+    check_paraphrase, check_internet_plagiarism, warmup, scrape_flight, page_flight
+)
+from modules.ParaphraseDetection.model_loader import encoder_slots
+from modules.admission import AdmissionController, AdmissionRejected
 
 app = Flask(__name__)
 
 # IMPORTANT: This must allow the origin of your React app
-CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}})
+CORS(app, resources={r"/api/*": {"origins": "http://localhost:3000"}},
+     expose_headers=["Retry-After", "X-Queue-Time-Ms"])
+
+# --- ADMISSION CONTROL ---
+# Cheap, interactive pair checks and expensive internet scans get separate limits,
+# so a burst of scans (7 threads + browsers each) can't starve the pair checks.
+pair_admission = AdmissionController(
+    "check-paraphrase",
+    max_concurrent=int(os.getenv("PAIR_MAX_CONCURRENT", "8")),
+    max_queue=int(os.getenv("PAIR_MAX_QUEUE", "32")),
+    queue_timeout=float(os.getenv("PAIR_QUEUE_TIMEOUT", "5"))
+)
+scan_admission = AdmissionController(
+    "check-internet",
+    max_concurrent=int(os.getenv("SCAN_MAX_CONCURRENT", "2")),
+    max_queue=int(os.getenv("SCAN_MAX_QUEUE", "10")),
+    queue_timeout=float(os.getenv("SCAN_QUEUE_TIMEOUT", "300"))
+)
+
+def admitted(controller):
+    """
+    Runs the route only once the controller admits it; answers 429 + Retry-After
+    straight away when saturated. Adds the time spent queued as X-Queue-Time-Ms.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                queued = controller.acquire()
+            except AdmissionRejected as e:
+                print(f"🚦 Rejected {controller.name} request ({e.reason}), retry in {e.retry_after}s")
+                response = jsonify({"error": "Server is busy, please try again shortly.", "retry_after": e.retry_after})
+                response.status_code = 429
+                response.headers["Retry-After"] = str(e.retry_after)
+                return response
+
+            start = time.perf_counter()
+            try:
+                response = app.make_response(view(*args, **kwargs))
+            finally:
+                controller.release(time.perf_counter() - start)
+            response.headers["X-Queue-Time-Ms"] = str(round(queued * 1000, 1))
+            return response
+        return wrapper
+    return decorator
 
 print("--- 🔌 Server Starting ---")
 
 # --- 1. ROUTE FOR TWO-TEXT COMPARISON ---
 @app.route('/api/check-paraphrase', methods=['POST'])
+@admitted(pair_admission)
 def check():
     data = request.json
     source_text = data.get('sourceText', '')
@@ -34,6 +86,7 @@ def check():
 
 # --- 2. ROUTE FOR INTERNET SEARCH (THIS WAS MISSING) ---
 @app.route('/api/check-internet', methods=['POST'])
+@admitted(scan_admission)
 def check_internet():
     data = request.json
     student_text = data.get('studentText', '')
@@ -52,6 +105,26 @@ def check_internet():
         print(f"❌ Internet Error: {e}")
         return jsonify({"error": str(e)}), 500
 
+# --- 3. QUEUE / RESOURCE METRICS ---
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    return jsonify({
+        "admission": {
+            "check_paraphrase": pair_admission.stats(),
+            "check_internet": scan_admission.stats()
+        },
+        "encoder": encoder_slots.stats(),
+        "single_flight": {
+            "scrape": scrape_flight.stats(),
+            "encode": page_flight.stats()
+        }
+    })
+
 if __name__ == '__main__':
+    # Load LaBSE + caches in the background so the first request doesn't pay for it.
+    # With debug=True only the reloader's child process (WERKZEUG_RUN_MAIN) serves requests.
+    if os.getenv("PLAGIARISM_WARMUP", "1") == "1" and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        threading.Thread(target=warmup, daemon=True).start()
+
     print("🚀 Paraphrase Detection API is running on http://localhost:5000")
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -1,36 +1,43 @@
 # test_db.py
-from database.db_config import get_db_connection
-import mysql.connector
+# Run with DB_BACKEND=sqlite to test without a MySQL server.
+from database.db_config import DB_BACKEND, DB_ERRORS, DB_POOL_SIZE, get_db_connection
+from database.synonym_store import ensure_schema, fetch_synonyms_bulk
 
 try:
-    print("Attempting to connect...")
+    print(f"Attempting to connect ({DB_BACKEND}, pool size {DB_POOL_SIZE})...")
     
-    # 1. Try to get the connection
+    # 1. Try to get a connection from the pool
     conn = get_db_connection()
     
     # 2. If we get here, the login worked. Now let's check the database info.
     if conn.is_connected():
-        db_info = conn.get_server_info()
-        print(f"✅ SUCCESS! Connected to MySQL Server version {db_info}")
-        
-        # 3. Let's check if your table exists
         cursor = conn.cursor()
-        cursor.execute("SHOW TABLES;")
+        if DB_BACKEND == "mysql":
+            print(f"✅ SUCCESS! Connected to MySQL Server version {conn.get_server_info()}")
+            cursor.execute("SHOW TABLES;")
+        else:
+            print("✅ SUCCESS! Opened SQLite database.")
+            cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table';")
         tables = cursor.fetchall()
         
-        print(f"📂 Database '{conn.database}' contains these tables:")
+        print("📂 Database contains these tables:")
         for table in tables:
             print(f" - {table[0]}")
             
         cursor.close()
-        conn.close()
-        print("\nConnection closed. You are ready to go!")
+        conn.close()   # Returns the connection to the pool
+
+    # 3. Make sure the table exists and a bulk lookup works in one round-trip
+    ensure_schema()
+    synonym_map = fetch_synonyms_bulk(['මව', 'ගෙදර', 'ගියාය'])
+    print(f"🔎 Bulk lookup: {synonym_map}")
+    print("\nConnection returned to pool. You are ready to go!")
         
-except mysql.connector.Error as err:
+except DB_ERRORS as err:
     # This block runs if something goes wrong
     print(f"\n❌ ERROR: Could not connect.")
     print(f"Reason: {err}")
     
 except ImportError:
     print("\n❌ ERROR: Python cannot find your 'database' folder.")
-    print("Make sure you are running this script from the root 'SinhalaParaphraseProject' folder.")
\ No newline at end of file
+    print("Make sure you are running this script from the root 'SinhalaParaphraseProject' folder.")
@@ -0,0 +1,55 @@
+# test_fingerprint.py
+from modules.ParaphraseDetection.fingerprint import FingerprintIndex, fingerprint_document, explain_sentences
+
+print("--- 🧬 Testing Winnowing Fingerprints (Verbatim Fast Path) ---")
+
+def split(text):
+    return [s.strip() for s in text.split('.') if len(s.strip()) > 10]
+
+# Source page (e.g. a scraped website)
+source = ("ශ්‍රී ලංකාව ඉන්දියන් සාගරයේ පිහිටි දිවයිනකි. "
+          "එහි ජනගහනය මිලියන විසි එකකට ආසන්න වන අතර අගනුවර කොළඹ වේ. "
+          "තේ කොපි රබර් වැනි වගාවන් ප්‍රධාන ආර්ථික මූලාශ්‍ර වේ.")
+
+# Student text: one original sentence, one lightly edited copy (+'නගරය'), one verbatim copy
+student = ("මගේ රචනය ආරම්භ වන්නේ මෙසේය පළමුව. "
+           "එහි ජනගහනය මිලියන විසි එකකට ආසන්න වන අතර අගනුවර කොළඹ නගරය වේ. "
+           "තේ කොපි රබර් වැනි වගාවන් ප්‍රධාන ආර්ථික මූලාශ්‍ර වේ.")
+
+index = FingerprintIndex()
+source_doc = index.add_document("source", source, split(source))
+student_doc = fingerprint_document(student, split(student))
+
+spans = index.find_overlaps(student_doc).get("source", [])
+for span in spans:
+    print(f"   Span: student chars {span['student_chars']} <-> source chars {span['source_chars']}")
+
+explained = explain_sentences(student_doc, source_doc, spans)
+print("-" * 30)
+for idx, match in sorted(explained.items()):
+    print(f"   Sentence {idx}: {match['coverage']}% copied -> '{match['source_sentence']}'")
+print("-" * 30)
+
+# EXPECTED RESULT:
+# Sentence 1 is explained at 90% (the inserted 'නගරය' is not counted), sentence 2 at 100%;
+# sentence 0 goes to the semantic engine.
+
+print("\n--- 🚫 Negative Case: Original Sentence Between Two Copies ---")
+
+# The short middle sentences share no words, but sit between two copied sentences,
+# so fingerprint hits on either side fall on the same alignment and get merged.
+copied_a = "එහි ජනගහනය මිලියන විසි එකකට ආසන්න වන අතර අගනුවර කොළඹ වේ"
+copied_c = "තේ කොපි රබර් වැනි වගාවන් ප්‍රධාන ආර්ථික මූලාශ්‍ර වේ"
+source = f"{copied_a}. ගංගාව නිල් පාටයි. {copied_c}."
+student = f"{copied_a}. මගේ රචනය ආරම්භය. {copied_c}."
+
+index = FingerprintIndex()
+source_doc = index.add_document("source", source, split(source))
+student_doc = fingerprint_document(student, split(student))
+explained = explain_sentences(student_doc, source_doc, index.find_overlaps(student_doc).get("source", []))
+
+print(f"   Explained sentences: {sorted(explained)}")
+print(f"   Middle sentence reported as copied: {1 in explained}")
+
+# EXPECTED RESULT:
+# Explained sentences: [0, 2]; the middle sentence is NOT reported as copied (False)
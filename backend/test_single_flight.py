@@ -0,0 +1,34 @@
+# test_single_flight.py
+import time
+from concurrent.futures import ThreadPoolExecutor
+from modules.single_flight import SingleFlight
+
+print("--- 🤝 Testing Single-Flight (Shared Scrapes / Encodes) ---")
+
+flight = SingleFlight("scrape")
+calls = []
+
+def slow_scrape(url):
+    # Stands in for launching Chromium + scraping the page
+    calls.append(url)
+    time.sleep(0.5)
+    return f"content of {url}"
+
+# SCENARIO: 10 students submit at once and all discover the same 2 URLs
+urls = ["https://si.wikipedia.org/a", "https://si.wikipedia.org/b"] * 10
+
+start = time.perf_counter()
+with ThreadPoolExecutor(max_workers=20) as executor:
+    results = list(executor.map(lambda u: flight.do(u, slow_scrape, u), urls))
+elapsed = time.perf_counter() - start
+
+print("-" * 30)
+print(f"Requests:       {len(urls)}")
+print(f"Actual scrapes: {len(calls)}")
+print(f"All got result: {all(r == f'content of {u}' for r, u in zip(results, urls))}")
+print(f"Time taken:     {elapsed:.2f}s")
+print(f"Stats:          {flight.stats()}")
+print("-" * 30)
+
+# EXPECTED RESULT:
+# Actual scrapes: 2 (one per unique URL), time ~0.5s instead of 10 x 0.5s